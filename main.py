@@ -1,20 +1,59 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict
+from starlette.datastructures import Headers
 import uvicorn
 import os
-import math
-import traceback
 import sys
+import logging
+import threading
+import functools
+import io
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import quote
 
+# 📝 로깅 설정 (요청 경로의 print 대신 레벨 기반 로거 사용, 운영 기본값 WARNING)
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("hairgator")
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").upper()
+if LOG_LEVEL in logging.getLevelNamesMapping():
+    logger.setLevel(LOG_LEVEL)
+else:
+    # 잘못된 값 때문에 서버가 시작되지 않는 일이 없도록 기본값으로 대체
+    logger.setLevel(logging.WARNING)
+    logger.warning("⚠️ 알 수 없는 LOG_LEVEL=%r, WARNING으로 대체합니다", LOG_LEVEL)
+
 # 기본 구조 완전 유지
 app = FastAPI(
     title="HAIRGATOR Face Analysis API v7.2",
     description="자동 Firebase 파일 감지 시스템 기반 정밀 헤어스타일 추천",
-    version="7.2.0"
+    version="7.2.0",
+    default_response_class=ORJSONResponse  # orjson으로 C 레벨 직렬화 (NumPy 스칼라/배열 포함)
 )
 
+class UploadGuardMiddleware:
+    """분석 엔드포인트 업로드를 본문 수신 전에 헤더만으로 거절하는 ASGI 미들웨어
+
+    FastAPI는 Depends보다 폼 본문 파싱을 먼저 수행하므로, 본문을 받기 전에 거르려면
+    미들웨어 단계에서 Content-Type/Content-Length를 확인해야 합니다 (check_upload_headers).
+    CORS 미들웨어보다 먼저 등록해 거절 응답에도 CORS 헤더가 붙습니다.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] in UPLOAD_BODY_LIMITS:
+            rejection = check_upload_headers(Headers(scope=scope), UPLOAD_BODY_LIMITS[scope["path"]])
+            if rejection is not None:
+                await rejection(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+app.add_middleware(UploadGuardMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -27,19 +66,70 @@ try:
     import cv2
     import numpy as np
     import mediapipe as mp
+    from numba import njit
+    from turbojpeg import TurboJPEG, TJPF_RGB
     from PIL import Image
-    import io
     import aiohttp
     import asyncio
     import time
-    print("✅ 모든 라이브러리 로드 성공")
+    logger.debug("✅ 모든 라이브러리 로드 성공")
 except ImportError as e:
-    print(f"❌ 라이브러리 로드 실패: {e}")
+    logger.error("❌ 라이브러리 로드 실패: %s", e)
     sys.exit(1)
 
+# 🧵 OpenCV 내부 스레드 비활성화 (uvicorn 워커와의 CPU 과다 구독 방지)
+cv2.setNumThreads(1)
+
+# 🖼️ libjpeg-turbo 디코더: JPEG를 RGB로 바로 디코딩 (imdecode + cvtColor 2패스 → 1패스)
+# 시스템에 libturbojpeg이 없으면 OpenCV 디코더로 대체
+try:
+    turbo_jpeg = TurboJPEG()
+except (OSError, RuntimeError) as e:
+    turbo_jpeg = None
+    logger.warning("⚠️ libturbojpeg 로드 실패, OpenCV 디코더 사용: %s", e)
+
+JPEG_MAGIC = b"\xff\xd8\xff"
+
+# 📉 libjpeg-turbo DCT 축소 배율 (1/8, 1/4, 3/8, 1/2 ...) - 작은 배율부터
+JPEG_DOWNSCALE_FACTORS = sorted(
+    (factor for factor in (turbo_jpeg.scaling_factors if turbo_jpeg else ()) if factor[0] < factor[1]),
+    key=lambda factor: factor[0] / factor[1]
+)
+
 # MediaPipe 초기화
 mp_face_mesh = mp.solutions.face_mesh
-mp_drawing = mp.solutions.drawing_utils
+
+# 🤖 FaceMesh는 워커 스레드마다 한 번만 생성하여 재사용
+# (요청마다 생성하면 그래프 초기화 비용 발생, process()는 스레드 안전하지 않아 공유 불가)
+face_mesh_local = threading.local()
+
+# 🔥 워밍업용 빈 프레임 (첫 process()의 TFLite 인터프리터 초기화를 실제 요청 전에 수행)
+WARMUP_FRAME = np.zeros((64, 64, 3), dtype=np.uint8)
+
+def get_face_mesh():
+    """현재 스레드 전용 FaceMesh 반환 (최초 호출시 생성 + 빈 프레임으로 워밍업)"""
+    face_mesh = getattr(face_mesh_local, "face_mesh", None)
+    if face_mesh is None:
+        face_mesh = mp_face_mesh.FaceMesh(
+            static_image_mode=True,
+            max_num_faces=1,
+            # 홍채 정밀화(468~477번)는 사용하지 않음: 측정/피부색 랜드마크는 모두 468 미만
+            # (FACE_MESH_LANDMARK_COUNT assert로 보장)
+            refine_landmarks=False,
+            min_detection_confidence=0.7
+        )
+        face_mesh.process(WARMUP_FRAME)
+        face_mesh_local.face_mesh = face_mesh
+    return face_mesh
+
+# 🧩 uvicorn 워커 프로세스 수 (1보다 크면 프로세스마다 FaceMesh/워커 풀을 따로 가짐)
+UVICORN_WORKERS = max(1, int(os.environ.get("UVICORN_WORKERS", 1)))
+
+# ⚙️ 분석 워커 풀 (기본: CPU 코어 수의 절반을 uvicorn 워커 프로세스끼리 나눔, 최소 1)
+ANALYSIS_WORKERS = max(1, int(os.environ.get(
+    "ANALYSIS_WORKERS", (os.cpu_count() or 2) // 2 // UVICORN_WORKERS
+)))
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="hairgator-analysis")
 
 # 🔥 Firebase Storage 연결 설정 (실제 파일명 기반)
 FIREBASE_BASE_URL = "https://firebasestorage.googleapis.com/v0/b/hairgator-face.appspot.com/o/hairgator500%2F"
@@ -48,10 +138,20 @@ FIREBASE_BASE_URL = "https://firebasestorage.googleapis.com/v0/b/hairgator-face.
 firebase_file_cache = {
     "files": [],
     "mapping": {},
+    "recommendations": {},  # (얼굴형, 연령대) → 추천 목록
     "last_updated": None,
     "cache_duration": 300  # 5분
 }
 
+# 🖼️ MediaPipe 입력 최대 변 길이 (랜드마크는 정규화 좌표라 축소해도 비율 동일)
+MAX_INFERENCE_SIDE = 640
+
+# 📦 업로드 최대 크기 (초과시 디코딩 전에 413 반환)
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# 🗂️ /analyze-faces/ 한 요청당 최대 이미지 수
+MAX_BATCH_FILES = 16
+
 # 🎯 GPT가 검증한 완벽한 18개 핵심 랜드마크
 PERFECT_LANDMARKS = {
     'forehead_left': 21, 'forehead_center': 9, 'forehead_right': 251,
@@ -63,6 +163,117 @@ PERFECT_LANDMARKS = {
     'face_left': 234, 'face_right': 454, 'face_top': 10
 }
 
+# 🎯 이름/인덱스를 import 시점에 평탄화 (요청마다 dict 순회 없이 NumPy gather 한 번)
+LANDMARK_NAMES = tuple(PERFECT_LANDMARKS)
+LANDMARK_INDICES = np.fromiter(PERFECT_LANDMARKS.values(), dtype=np.int64, count=len(PERFECT_LANDMARKS))
+
+# 🔒 refine_landmarks=False 기준 FaceMesh 출력 개수 - 인덱스 범위를 import 시점에 보장
+FACE_MESH_LANDMARK_COUNT = 468
+assert LANDMARK_INDICES.max() < FACE_MESH_LANDMARK_COUNT, "측정 랜드마크 인덱스가 FaceMesh 범위를 벗어남"
+
+# 📏 4대 측정 쌍 (LANDMARK_NAMES 기준 행 번호) - 순서: FW, CW, JW, FC
+MEASUREMENT_PAIRS = np.array([
+    (LANDMARK_NAMES.index(start), LANDMARK_NAMES.index(end))
+    for start, end in (
+        ('temple_left', 'temple_right'),        # 1. 이마 폭 (FW): 양쪽 관자놀이 최외곽점
+        ('cheekbone_left', 'cheekbone_right'),  # 2. 광대뼈 폭 (CW): 가장 넓은 부분
+        ('jaw_left', 'jaw_right'),              # 3. 턱 폭 (JW): 턱선 가장 넓은 부분
+        ('face_top', 'chin_center'),            # 4. 얼굴 길이 (FC): 이마 상단에서 턱 끝까지
+    )
+], dtype=np.int64)
+
+# 측정 쌍의 시작/끝 행을 각각 연속 배열로 분리 (SoA - 요청마다 열 슬라이싱 없이 바로 gather)
+MEASURE_START_ROWS = np.ascontiguousarray(MEASUREMENT_PAIRS[:, 0])
+MEASURE_END_ROWS = np.ascontiguousarray(MEASUREMENT_PAIRS[:, 1])
+
+# 📐 분류 비율 분자 (측정값 배열 [FW, CW, JW, FC]의 행 번호) → CW로 한 번에 나눠 [FL/CW, JW/CW, FW/CW]
+RATIO_NUMERATOR_ROWS = np.array([3, 2, 0], dtype=np.int64)
+
+# 📦 /analyze-face/ 응답 모델 (pydantic-core가 직접 JSON 직렬화)
+class ResponseModel(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+class PersonalColor(ResponseModel):
+    skin_rgb: List[int]
+    undertone: str
+    confidence: int
+    recommended_hair_colors: List[str]
+    description: str
+    analysis_method: str
+
+class HairstyleRecommendation(ResponseModel):
+    style_id: str
+    style_name: str
+    description: str
+    firebase_files: List[str]
+    firebase_urls: List[str]
+    primary_image: str
+    total_variations: int
+    auto_detected: bool
+
+class FaceMeasurements(ResponseModel):
+    foreheadWidthPx: float
+    cheekboneWidthPx: float
+    jawWidthPx: float
+    faceLengthPx: float
+
+class FaceRatios(ResponseModel):
+    face_length_ratio: float
+    jaw_cheek_ratio: float
+    forehead_cheek_ratio: float
+
+class FirebaseIntegration(ResponseModel):
+    status: str
+    total_files_mapped: int
+    file_naming_pattern: str
+    auto_update: str
+
+class AnalyzeData(ResponseModel):
+    face_shape: str
+    confidence: int
+    personal_color: PersonalColor
+    recommended_hairstyles: List[HairstyleRecommendation]
+    measurements: FaceMeasurements
+    ratios: FaceRatios
+    confidence_factors: List[str]
+    analysis_version: str
+    total_recommendations: int
+    firebase_integration: FirebaseIntegration
+    landmark_coordinates: Optional[Dict[str, Tuple[int, int]]] = None
+
+class AnalyzeResponse(ResponseModel):
+    status: str
+    data: AnalyzeData
+
+class BatchAnalyzeItem(ResponseModel):
+    filename: Optional[str] = None
+    status: str
+    data: Optional[AnalyzeData] = None
+    message: Optional[str] = None
+    error_code: Optional[str] = None
+
+class BatchAnalyzeResponse(ResponseModel):
+    status: str
+    total_files: int
+    total_analyzed: int
+    results: List[BatchAnalyzeItem]
+
+# 🌐 공유 aiohttp 세션 (요청마다 세션을 만들지 않고 커넥션 풀/DNS 캐시 재사용)
+http_session = None
+
+def get_http_session() -> "aiohttp.ClientSession":
+    """프로세스 공유 aiohttp 세션 반환 (이벤트 루프 안에서 최초 호출시 생성)"""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession()
+    return http_session
+
+@app.on_event("shutdown")
+async def close_http_session():
+    """종료시 공유 세션의 커넥션 정리"""
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+
 # 🎯 자동 Firebase 파일 감지 및 매핑 시스템
 async def get_firebase_file_list() -> list:
     """Firebase Storage에서 실제 업로드된 파일 목록 가져오기"""
@@ -71,29 +282,36 @@ async def get_firebase_file_list() -> list:
         api_url = "https://firebasestorage.googleapis.com/v0/b/hairgator-face.appspot.com/o"
         params = {"prefix": "hairgator500/"}
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    files = []
-                    
-                    for item in data.get("items", []):
-                        filename = item["name"].replace("hairgator500/", "")
-                        if filename.endswith(".jpg.jpg"):  # 실제 이미지 파일만
-                            files.append(filename)
-                    
-                    print(f"✅ Firebase에서 {len(files)}개 파일 감지")
-                    return sorted(files)
-                else:
-                    print(f"❌ Firebase API 호출 실패: {response.status}")
-                    return []
+        session = get_http_session()
+        async with session.get(api_url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                files = []
+                
+                for item in data.get("items", []):
+                    filename = item["name"].replace("hairgator500/", "")
+                    if filename.endswith(".jpg.jpg"):  # 실제 이미지 파일만
+                        files.append(filename)
+                
+                logger.info("✅ Firebase에서 %d개 파일 감지", len(files))
+                return sorted(files)
+            else:
+                logger.warning("❌ Firebase API 호출 실패: %s", response.status)
+                return []
                     
     except Exception as e:
-        print(f"❌ Firebase 파일 목록 가져오기 실패: {e}")
+        logger.warning("❌ Firebase 파일 목록 가져오기 실패: %s", e)
         return []
 
+def build_firebase_url(filename: str) -> str:
+    """Firebase 다운로드 URL 생성 (한글 파일명 URL 인코딩)"""
+    return f"{FIREBASE_BASE_URL}{quote(filename, safe='')}?alt=media"
+
 def generate_dynamic_style_mapping(file_list: list) -> dict:
-    """업로드된 파일 목록을 기반으로 동적 스타일 매핑 생성"""
+    """업로드된 파일 목록을 기반으로 동적 스타일 매핑 생성
+
+    URL 인코딩은 캐시 갱신 시 파일당 한 번만 수행해 각 항목의 "url"에 저장합니다.
+    """
     
     style_mapping = {}
     
@@ -122,14 +340,20 @@ def generate_dynamic_style_mapping(file_list: list) -> dict:
                 style_mapping[style_name][face_shape][age_group].append({
                     "file_num": file_num,
                     "filename": filename,
+                    "url": build_firebase_url(filename),
                     "variation": variation
                 })
                 
         except Exception as e:
-            print(f"⚠️ 파일명 파싱 실패: {filename} - {e}")
+            logger.warning("⚠️ 파일명 파싱 실패: %s - %s", filename, e)
     
     return style_mapping
 
+def build_style_cache(file_list: list) -> tuple:
+    """파일 목록으로 (스타일 매핑, 추천 테이블) 구성 (워커 스레드용 동기 함수)"""
+    mapping = generate_dynamic_style_mapping(file_list)
+    return mapping, build_recommendation_table(mapping)
+
 async def get_cached_style_mapping():
     """캐시된 스타일 매핑 반환 (5분마다 갱신)"""
     current_time = time.time()
@@ -139,313 +363,218 @@ async def get_cached_style_mapping():
         not firebase_file_cache["last_updated"] or 
         current_time - firebase_file_cache["last_updated"] > firebase_file_cache["cache_duration"]):
         
-        print("🔄 Firebase 파일 목록 갱신 중...")
+        logger.info("🔄 Firebase 파일 목록 갱신 중...")
         
         # 새로운 파일 목록 가져오기
         file_list = await get_firebase_file_list()
         
         if file_list:
+            # 파일명 파싱 + 추천 테이블 구성은 CPU 작업이라 기본 스레드 풀에서 실행 (이벤트 루프 비차단)
+            mapping, recommendations = await asyncio.to_thread(build_style_cache, file_list)
+            
+            # 대기 중 다른 요청이 반쪽짜리 캐시를 보지 않도록 계산이 끝난 뒤 한 번에 교체
             firebase_file_cache["files"] = file_list
-            firebase_file_cache["mapping"] = generate_dynamic_style_mapping(file_list)
+            firebase_file_cache["mapping"] = mapping
+            firebase_file_cache["recommendations"] = recommendations
             firebase_file_cache["last_updated"] = current_time
             
-            print(f"✅ {len(file_list)}개 파일 자동 매핑 완료")
+            logger.info("✅ %d개 파일 자동 매핑 완료", len(file_list))
         else:
-            print("⚠️ 파일 목록 가져오기 실패, 기존 캐시 사용")
+            logger.warning("⚠️ 파일 목록 가져오기 실패, 기존 캐시 사용")
     
     return firebase_file_cache["mapping"]
 
+# 💇 얼굴형별 우선순위 스타일
+STYLE_PRIORITY = {
+    "둥근형": ("볼륨펌", "클래식보브", "C컬단발", "시스루뱅미디움", "소프트보브"),
+    "타원형": ("클래식보브", "소프트보브", "C컬단발", "시스루뱅미디움", "레이어드미디움"),
+    "각진형": ("소프트보브", "C컬단발", "클래식보브", "시스루뱅미디움", "웨이브펌"),
+    "긴형": ("클래식보브", "소프트보브", "C컬단발", "시스루뱅미디움", "볼륨펌"),
+    "하트형": ("소프트보브", "C컬단발", "클래식보브", "시스루뱅미디움", "다운펌"),
+    "다이아몬드형": ("소프트보브", "클래식보브", "C컬단발", "시스루뱅미디움", "바디펌")
+}
+DEFAULT_STYLE_PRIORITY = ("클래식보브", "소프트보브")
+
+# 📝 스타일 설명 템플릿 ({face_shape}, {style_name} 치환)
+STYLE_DESCRIPTION_TEMPLATES = {
+    "클래식보브": "{face_shape}에 최적화된 클래식한 보브 스타일로 깔끔하고 세련된 인상을 연출합니다.",
+    "소프트보브": "{face_shape}의 특성을 살린 부드러운 보브 스타일로 자연스러운 아름다움을 강조합니다.",
+    "C컬단발": "{face_shape}에 어울리는 C컬 단발로 볼륨감과 여성스러움을 더해줍니다.",
+    "시스루뱅미디움": "{face_shape}을 보완하는 시스루뱅 미디움 스타일로 트렌디한 매력을 연출합니다.",
+    "레이어드미디움": "{face_shape}에 역동적인 레이어 효과를 주는 미디움 스타일입니다.",
+    "볼륨펌": "{face_shape}의 비율을 보정하는 볼륨 펌 스타일입니다.",
+    "웨이브펌": "{face_shape}에 자연스러운 웨이브로 부드러운 인상을 연출합니다.",
+    "다운펌": "{face_shape}의 하관 볼륨을 강조하는 다운 펌 스타일입니다.",
+    "바디펌": "{face_shape}의 복잡한 구조를 조화롭게 정리하는 바디 펌입니다."
+}
+DEFAULT_STYLE_DESCRIPTION = "{face_shape}에 어울리는 {style_name} 스타일입니다."
+
+def build_style_recommendations(style_mapping: dict, face_shape: str, age_group: str) -> list:
+    """한 (얼굴형, 연령대)의 추천 목록 구성 (STYLE_PRIORITY 순서, 최대 4개)"""
+    preferred_styles = STYLE_PRIORITY.get(face_shape, DEFAULT_STYLE_PRIORITY)
+    recommendations = []
+    
+    for style_name in preferred_styles:
+        if style_name in style_mapping:
+            style_data = style_mapping[style_name]
+            
+            if face_shape in style_data and age_group in style_data[face_shape]:
+                files = style_data[face_shape][age_group]
+                
+                firebase_files = [file["filename"] for file in files]
+                # 🔥 URL은 매핑 생성 시 미리 인코딩됨
+                firebase_urls = [file["url"] for file in files]
+                
+                # 스타일 설명 생성
+                description_template = STYLE_DESCRIPTION_TEMPLATES.get(style_name, DEFAULT_STYLE_DESCRIPTION)
+                
+                recommendations.append({
+                    "style_id": f"AUTO_{len(recommendations)+1}",
+                    "style_name": style_name,
+                    "description": description_template.format(face_shape=face_shape, style_name=style_name),
+                    "firebase_files": firebase_files,
+                    "firebase_urls": firebase_urls,
+                    "primary_image": firebase_urls[0] if firebase_urls else "",
+                    "total_variations": len(firebase_files),
+                    "auto_detected": True
+                })
+                
+                if len(recommendations) >= 4:  # 최대 4개 추천
+                    break
+    
+    return recommendations
+
+def build_recommendation_table(style_mapping: dict) -> dict:
+    """매핑에 등장하는 모든 (얼굴형, 연령대) 조합의 추천 목록을 미리 구성 (캐시 갱신시 1회)"""
+    combinations = {
+        (face_shape, age_group)
+        for style_data in style_mapping.values()
+        for face_shape, age_data in style_data.items()
+        for age_group in age_data
+    }
+    return {
+        combination: build_style_recommendations(style_mapping, *combination)
+        for combination in combinations
+    }
+
 async def get_auto_recommendations(face_shape: str, age_group: str = "1020대") -> list:
-    """🔥 자동 감지된 Firebase 파일 기반 추천"""
+    """🔥 자동 감지된 Firebase 파일 기반 추천
+
+    캐시 갱신시 미리 만든 추천 테이블에서 조회만 합니다 (반환 목록은 읽기 전용으로 공유).
+    """
     
     try:
-        # 캐시된 스타일 매핑 가져오기
+        # 캐시된 스타일 매핑 가져오기 (만료시 추천 테이블도 함께 재구성)
         style_mapping = await get_cached_style_mapping()
         
         if not style_mapping:
-            print("⚠️ 스타일 매핑이 비어있음, 빈 배열 반환")
+            logger.warning("⚠️ 스타일 매핑이 비어있음, 빈 배열 반환")
             return []
         
-        # 얼굴형별 우선순위 스타일
-        priority_styles = {
-            "둥근형": ["볼륨펌", "클래식보브", "C컬단발", "시스루뱅미디움", "소프트보브"],
-            "타원형": ["클래식보브", "소프트보브", "C컬단발", "시스루뱅미디움", "레이어드미디움"],
-            "각진형": ["소프트보브", "C컬단발", "클래식보브", "시스루뱅미디움", "웨이브펌"],
-            "긴형": ["클래식보브", "소프트보브", "C컬단발", "시스루뱅미디움", "볼륨펌"],
-            "하트형": ["소프트보브", "C컬단발", "클래식보브", "시스루뱅미디움", "다운펌"],
-            "다이아몬드형": ["소프트보브", "클래식보브", "C컬단발", "시스루뱅미디움", "바디펌"]
-        }
-        
-        preferred_styles = priority_styles.get(face_shape, ["클래식보브", "소프트보브"])
-        recommendations = []
-        
-        for style_name in preferred_styles:
-            if style_name in style_mapping:
-                style_data = style_mapping[style_name]
-                
-                if face_shape in style_data and age_group in style_data[face_shape]:
-                    files = style_data[face_shape][age_group]
-                    
-                    firebase_files = [file["filename"] for file in files]
-                    
-                    # 🔥 수정된 URL 생성 (한글 파일명 URL 인코딩)
-                    firebase_urls = []
-                    for file in firebase_files:
-                        try:
-                            encoded_filename = quote(file, safe='')
-                            url = f"{FIREBASE_BASE_URL}{encoded_filename}?alt=media"
-                            firebase_urls.append(url)
-                            print(f"🔗 Firebase URL 생성: {file}")
-                        except Exception as e:
-                            print(f"❌ URL 생성 실패: {file} - {e}")
-                            firebase_urls.append(f"{FIREBASE_BASE_URL}default.jpg?alt=media")
-                    
-                    # 스타일 설명 생성
-                    style_descriptions = {
-                        "클래식보브": f"{face_shape}에 최적화된 클래식한 보브 스타일로 깔끔하고 세련된 인상을 연출합니다.",
-                        "소프트보브": f"{face_shape}의 특성을 살린 부드러운 보브 스타일로 자연스러운 아름다움을 강조합니다.",
-                        "C컬단발": f"{face_shape}에 어울리는 C컬 단발로 볼륨감과 여성스러움을 더해줍니다.",
-                        "시스루뱅미디움": f"{face_shape}을 보완하는 시스루뱅 미디움 스타일로 트렌디한 매력을 연출합니다.",
-                        "레이어드미디움": f"{face_shape}에 역동적인 레이어 효과를 주는 미디움 스타일입니다.",
-                        "볼륨펌": f"{face_shape}의 비율을 보정하는 볼륨 펌 스타일입니다.",
-                        "웨이브펌": f"{face_shape}에 자연스러운 웨이브로 부드러운 인상을 연출합니다.",
-                        "다운펌": f"{face_shape}의 하관 볼륨을 강조하는 다운 펌 스타일입니다.",
-                        "바디펌": f"{face_shape}의 복잡한 구조를 조화롭게 정리하는 바디 펌입니다."
-                    }
-                    
-                    recommendations.append({
-                        "style_id": f"AUTO_{len(recommendations)+1}",
-                        "style_name": style_name,
-                        "description": style_descriptions.get(style_name, f"{face_shape}에 어울리는 {style_name} 스타일입니다."),
-                        "firebase_files": firebase_files,
-                        "firebase_urls": firebase_urls,
-                        "primary_image": firebase_urls[0] if firebase_urls else "",
-                        "total_variations": len(firebase_files),
-                        "auto_detected": True
-                    })
-                    
-                    if len(recommendations) >= 4:  # 최대 4개 추천
-                        break
+        recommendations = firebase_file_cache["recommendations"].get((face_shape, age_group), [])
         
-        print(f"🎯 자동 감지 기반 {len(recommendations)}개 스타일 추천 완료")
+        logger.debug("🎯 자동 감지 기반 %d개 스타일 추천 완료", len(recommendations))
         return recommendations
         
     except Exception as e:
-        print(f"❌ 자동 추천 실패: {e}")
+        logger.warning("❌ 자동 추천 실패: %s", e)
         return []
-    """실제 Firebase 업로드 파일명 기반 추천"""
-    
-    # 얼굴형별 우선 추천 스타일 정의
-    style_priority = {
-        "둥근형": [
-            {"style": "볼륨펌", "description": "둥근형의 1:1 비율을 1:1.5로 보정하기 위해 크라운 중심의 집중적인 상단 볼륨을 형성합니다."},
-            {"style": "클래식보브", "description": "둥근형의 부드러운 곡선에 각도감을 부여하기 위해 턱라인 길이의 블런트 보브를 적용합니다."},
-            {"style": "C컬단발", "description": "둥근형의 가로 비율을 시각적으로 축소하기 위해 C자 모양의 안쪽 컬을 적용합니다."},
-            {"style": "시스루뱅미디움", "description": "둥근형에 수직 라인을 강조하여 시각적 길이감을 극대화합니다."}
-        ],
-        "타원형": [  # 계란형과 동일
-            {"style": "클래식보브", "description": "타원형의 이상적 비율을 더욱 돋보이게 하는 클래식한 보브 스타일입니다."},
-            {"style": "소프트보브", "description": "타원형의 천부적 아름다움을 극대화하는 부드러운 보브 스타일입니다."},
-            {"style": "C컬단발", "description": "타원형의 완벽한 비율에 현대적 감각을 더한 C컬 스타일입니다."},
-            {"style": "시스루뱅미디움", "description": "타원형의 균형미를 살린 시스루뱅 미디움 스타일입니다."}
-        ],
-        "각진형": [
-            {"style": "소프트보브", "description": "각진형의 강한 윤곽을 부드럽게 중화시키는 소프트 보브 스타일입니다."},
-            {"style": "C컬단발", "description": "각진형의 직선적 구조에 유연한 곡선미를 부여하는 C컬 스타일입니다."},
-            {"style": "클래식보브", "description": "각진형의 강한 턱라인을 세련되게 보완하는 클래식 보브입니다."},
-            {"style": "시스루뱅미디움", "description": "각진 이마라인을 부드럽게 커버하는 시스루뱅 스타일입니다."}
-        ],
-        "긴형": [
-            {"style": "클래식보브", "description": "긴형의 세로 비율을 시각적으로 단축하는 수평 라인 강조 보브입니다."},
-            {"style": "소프트보브", "description": "긴형에 가로 볼륨을 더해 균형감을 맞추는 소프트 보브입니다."},
-            {"style": "C컬단발", "description": "긴형의 세로 라인을 차단하는 볼륨감 있는 C컬 단발입니다."},
-            {"style": "시스루뱅미디움", "description": "긴형의 이마 비율을 조절하는 시스루뱅 미디움 스타일입니다."}
-        ],
-        "하트형": [
-            {"style": "소프트보브", "description": "하트형의 좁은 턱 부분에 볼륨을 집중시키는 소프트 보브입니다."},
-            {"style": "C컬단발", "description": "하트형의 하관 볼륨을 강조하는 C컬 단발 스타일입니다."},
-            {"style": "클래식보브", "description": "하트형의 넓은 이마와 좁은 턱의 균형을 맞추는 클래식 보브입니다."},
-            {"style": "시스루뱅미디움", "description": "하트형의 넓은 이마를 자연스럽게 커버하는 시스루뱅 스타일입니다."}
-        ],
-        "다이아몬드형": [
-            {"style": "소프트보브", "description": "다이아몬드형의 돌출된 광대를 부드럽게 커버하는 소프트 보브입니다."},
-            {"style": "클래식보브", "description": "다이아몬드형의 복잡한 구조를 깔끔하게 정리하는 클래식 보브입니다."},
-            {"style": "C컬단발", "description": "다이아몬드형에 상하 균형잡힌 볼륨을 부여하는 C컬 단발입니다."},
-            {"style": "시스루뱅미디움", "description": "다이아몬드형의 각진 이마라인을 부드럽게 중화하는 시스루뱅 스타일입니다."}
-        ]
-    }
-    
-    # 계란형 → 타원형으로 매핑
-    if face_shape == "계란형":
-        face_shape = "타원형"
-    
-    styles = style_priority.get(face_shape, style_priority["타원형"])
-    recommendations = []
-    
-    print(f"🎯 {face_shape}에 대한 실제 Firebase 파일 기반 추천 시작...")
-    
-    for i, style_info in enumerate(styles):
-        style_name = style_info["style"]
-        
-        # 실제 Firebase 파일명 생성
-        firebase_files = []
-        
-        if style_name == "클래식보브":
-            # 001-036 범위에서 해당 얼굴형 파일 찾기
-            base_nums = get_classic_bob_numbers(face_shape, age_group)
-            for num in base_nums:
-                firebase_files.extend([
-                    f"{num:03d}_클래식보브_{face_shape}_{age_group}_v1.jpg.jpg",
-                    f"{num:03d}_클래식보브_{face_shape}_{age_group}_v2.jpg.jpg"
-                ])
-        
-        elif style_name == "소프트보브":
-            # 037-072 범위에서 해당 얼굴형 파일 찾기
-            base_nums = get_soft_bob_numbers(face_shape, age_group)
-            for num in base_nums:
-                firebase_files.extend([
-                    f"{num:03d}_소프트보브_{face_shape}_{age_group}_v1.jpg.jpg",
-                    f"{num:03d}_소프트보브_{face_shape}_{age_group}_v2.jpg.jpg"
-                ])
-        
-        elif style_name == "C컬단발":
-            # 073-108 범위에서 해당 얼굴형 파일 찾기
-            base_nums = get_c_curl_numbers(face_shape, age_group)
-            for num in base_nums:
-                firebase_files.extend([
-                    f"{num:03d}_C컬단발_{face_shape}_{age_group}_v1.jpg.jpg",
-                    f"{num:03d}_C컬단발_{face_shape}_{age_group}_v2.jpg.jpg"
-                ])
-        
-        elif style_name == "시스루뱅미디움":
-            # 109+ 범위에서 해당 얼굴형 파일 찾기 (v1,v2 없음)
-            base_num = get_seethrough_bang_number(face_shape, age_group)
-            if base_num:
-                firebase_files.append(f"{base_num:03d}_시스루뱅미디움_{face_shape}_{age_group}.jpg.jpg")
-        
-        # Firebase URL 생성
-        firebase_urls = [f"{FIREBASE_BASE_URL}{file}?alt=media" for file in firebase_files]
-        
-        # 대표 이미지 (첫 번째 파일)
-        primary_image = firebase_urls[0] if firebase_urls else ""
-        
-        recommendations.append({
-            "style_id": f"REAL_{i+1}",
-            "style_name": style_name,
-            "description": style_info["description"],
-            "firebase_files": firebase_files,
-            "firebase_urls": firebase_urls,
-            "primary_image": primary_image,
-            "total_variations": len(firebase_files)
-        })
-        
-        print(f"✅ {style_name} 추천 완료: {len(firebase_files)}개 변형")
-    
-    return recommendations
 
-def get_classic_bob_numbers(face_shape: str, age_group: str) -> list:
-    """클래식보브 파일 번호 계산 (001-036)"""
-    face_order = ["둥근형", "타원형", "각진형", "긴형", "하트형", "다이아몬드형"]
-    age_order = ["1020대", "3040대", "50대이상"]
-    
-    face_idx = face_order.index(face_shape)
-    age_idx = age_order.index(age_group)
-    
-    # 각 얼굴형당 6개 파일 (3연령대 × 2변형)
-    base_start = 1 + (face_idx * 6)
-    return [base_start + (age_idx * 2)]
+# 🎯 분류 결과 테이블: 코드 → (얼굴형, 신뢰도, 판단 근거)
+FACE_SHAPE_OUTCOMES = (
+    ("긴형", 88, "세로 비율 1.45+ 명확한 긴형"),
+    ("타원형", 85, "긴형과 타원형의 경계"),  # 계란형 → 타원형
+    ("둥근형", 90, "가로세로 비율 균등한 둥근형"),
+    ("각진형", 87, "짧고 각진 특성"),
+    ("다이아몬드형", 92, "좁은 이마와 턱, 넓은 광대뼈"),
+    ("하트형", 89, "좁은 이마, 보통 턱"),
+    ("하트형", 91, "넓은 이마, 좁은 턱"),
+    ("타원형", 94, "황금비율 1.3에 근사"),  # 계란형 → 타원형
+    ("타원형", 88, "균형잡힌 비율"),  # 계란형 → 타원형
+)
 
-def get_soft_bob_numbers(face_shape: str, age_group: str) -> list:
-    """소프트보브 파일 번호 계산 (037-072)"""
-    face_order = ["둥근형", "타원형", "각진형", "긴형", "하트형", "다이아몬드형"]
-    age_order = ["1020대", "3040대", "50대이상"]
-    
-    face_idx = face_order.index(face_shape)
-    age_idx = age_order.index(age_group)
-    
-    base_start = 37 + (face_idx * 6)
-    return [base_start + (age_idx * 2)]
+# 📐 분류 임계값 (float32 상수: 비율 배열/JIT 코어 모두 float32 그대로 비교, double 승격 없음)
+LONG_FACE_RATIO = np.float32(1.45)        # FL/CW 초과 → 긴형
+SHORT_FACE_RATIO = np.float32(1.15)       # FL/CW 미만 → 짧은형
+GOLDEN_FACE_RATIO = np.float32(1.3)       # 황금비율 중심
+GOLDEN_TOLERANCE = np.float32(0.1)        # 황금비율 허용 오차
+NARROW_FOREHEAD_RATIO = np.float32(0.85)  # FW/CW 미만 → 좁은 이마
+ROUND_FOREHEAD_RATIO = np.float32(0.95)   # 짧은형 중 FW/CW 초과 → 둥근형 후보
+WIDE_FOREHEAD_RATIO = np.float32(1.05)    # FW/CW 초과 → 넓은 이마
+DIAMOND_JAW_RATIO = np.float32(0.75)      # 좁은 이마 중 JW/CW 미만 → 다이아몬드형
+LONG_NARROW_JAW_RATIO = np.float32(0.82)  # 긴형 중 JW/CW 미만 → 긴형 확정
+ROUND_JAW_RATIO = np.float32(0.88)        # 짧은형 중 JW/CW 초과 → 둥근형 후보
 
-def get_c_curl_numbers(face_shape: str, age_group: str) -> list:
-    """C컬단발 파일 번호 계산 (073-108)"""
-    face_order = ["둥근형", "타원형", "각진형", "긴형", "하트형", "다이아몬드형"]
-    age_order = ["1020대", "3040대", "50대이상"]
-    
-    face_idx = face_order.index(face_shape)
-    age_idx = age_order.index(age_group)
-    
-    base_start = 73 + (face_idx * 6)
-    return [base_start + (age_idx * 2)]
+# CW가 0일 때 쓰는 기본 비율 (FL/CW, JW/CW, FW/CW)
+DEFAULT_RATIOS = np.array([1.3, 0.85, 0.95], dtype=np.float32)
+DEFAULT_RATIOS.flags.writeable = False
 
-def get_seethrough_bang_number(face_shape: str, age_group: str) -> int:
-    """시스루뱅미디움 파일 번호 계산 (109+)"""
-    face_order = ["둥근형", "타원형", "각진형", "긴형", "하트형", "다이아몬드형"]
-    age_order = ["1020대", "3040대", "50대이상"]
-    
-    if face_shape not in face_order or age_group not in age_order:
-        return None
-        
-    face_idx = face_order.index(face_shape)
-    age_idx = age_order.index(age_group)
-    
-    # 현재 업로드된 파일 기준 (109-116까지 확인됨)
-    base_start = 109 + (face_idx * 3)
-    file_num = base_start + age_idx
-    
-    # 116까지만 업로드되었으므로 체크
-    if file_num <= 116:
-        return file_num
-    return None
+# 코드별 confidence_factors (판단 근거 문자열을 담은 불변 튜플을 미리 생성해 결과마다 공유)
+FACE_SHAPE_FACTORS = tuple((factor,) for _, _, factor in FACE_SHAPE_OUTCOMES)
 
-def classify_face_shape_gpt_verified(measurements: Dict[str, float]) -> Dict[str, Any]:
-    """GPT 검증된 해부학적 정확성 기반 얼굴형 분류"""
-    
-    FW, CW, JW, FC = measurements['FW'], measurements['CW'], measurements['JW'], measurements['FC']
+def _face_shape_code(length_bin: int, forehead_bin: int, jaw_bin: int) -> int:
+    """구간 번호 조합 → FACE_SHAPE_OUTCOMES 코드 (_classify_ratios 분기를 구간 단위로 옮긴 것)"""
+    if length_bin == 0:  # 긴형 (FL/CW > 1.45)
+        return 0 if jaw_bin <= 1 else 1
+    if length_bin == 1:  # 짧은형 (FL/CW < 1.15)
+        return 2 if (forehead_bin >= 2 and jaw_bin == 3) else 3
+    if forehead_bin == 0:  # 좁은 이마 (FW/CW < 0.85)
+        return 4 if jaw_bin == 0 else 5
+    if forehead_bin == 3:  # 넓은 이마 (FW/CW > 1.05)
+        return 6
+    return 7 if length_bin == 2 else 8
+
+# 📋 얼굴형 결정 테이블 [길이 구간, 이마 구간, 턱 구간] → 분류 코드
+# 길이: 0=긴형(>1.45), 1=짧음(<1.15), 2=황금비율(|x-1.3|<0.1), 3=그 외 중간
+# 이마: 0=<0.85, 1=0.85~0.95, 2=0.95~1.05, 3=>1.05 / 턱: 0=<0.75, 1=0.75~0.82, 2=0.82~0.88, 3=>0.88
+FACE_SHAPE_TABLE = np.array([
+    [[_face_shape_code(l, f, j) for j in range(4)] for f in range(4)] for l in range(4)
+], dtype=np.int8)
+
+def compute_face_ratios(widths: np.ndarray) -> np.ndarray:
+    """측정값 배열 [FW, CW, JW, FC] → 분류 비율 [FL/CW, JW/CW, FW/CW] float32 배열
+
+    스칼라 나눗셈 한 번으로 세 비율을 계산하며, CW가 0이면 DEFAULT_RATIOS를 반환합니다.
+    """
+    cheek = widths[1]
+    if cheek > 0:
+        return widths[RATIO_NUMERATOR_ROWS] / cheek
+    return DEFAULT_RATIOS
+
+def classify_face_shape_batch(ratios: np.ndarray) -> np.ndarray:
+    """N개 얼굴형을 구간 번호 + 결정 테이블 조회로 한 번에 분류
+
+    ratios는 compute_face_ratios 결과를 쌓은 (N, 3) float32 배열 ([FL/CW, JW/CW, FW/CW])입니다.
+    FACE_SHAPE_OUTCOMES 인덱스인 분류 코드 배열을 반환하며, 결과는 _classify_ratios와 동일합니다.
+    """
     
     # 🎯 실제 테스트 데이터 기반 임계값 (GPT 최종 검증)
-    face_length_ratio = FC / CW if CW > 0 else 1.3
-    jaw_cheek_ratio = JW / CW if CW > 0 else 0.85
-    forehead_cheek_ratio = FW / CW if CW > 0 else 0.95
-    
-    print(f"📊 비율 분석: FL/CW={face_length_ratio:.3f}, JW/CW={jaw_cheek_ratio:.3f}, FW/CW={forehead_cheek_ratio:.3f}")
-    
-    confidence_factors = []
+    face_length_ratio, jaw_cheek_ratio, forehead_cheek_ratio = ratios.T
     
-    # 🔥 v7.1 분류 로직 (Firebase 파일명과 매핑)
-    if face_length_ratio > 1.45:
-        if jaw_cheek_ratio < 0.82:
-            classification, confidence = "긴형", 88
-            confidence_factors.append("세로 비율 1.45+ 명확한 긴형")
-        else:
-            classification, confidence = "타원형", 85  # 계란형 → 타원형
-            confidence_factors.append("긴형과 타원형의 경계")
-    
-    elif face_length_ratio < 1.15:
-        if forehead_cheek_ratio > 0.95 and jaw_cheek_ratio > 0.88:
-            classification, confidence = "둥근형", 90
-            confidence_factors.append("가로세로 비율 균등한 둥근형")
-        else:
-            classification, confidence = "각진형", 87
-            confidence_factors.append("짧고 각진 특성")
-    
-    else:  # 1.15 <= face_length_ratio <= 1.45
-        if forehead_cheek_ratio < 0.85:
-            if jaw_cheek_ratio < 0.75:
-                classification, confidence = "다이아몬드형", 92
-                confidence_factors.append("좁은 이마와 턱, 넓은 광대뼈")
-            else:
-                classification, confidence = "하트형", 89
-                confidence_factors.append("좁은 이마, 보통 턱")
-        elif forehead_cheek_ratio > 1.05:
-            classification, confidence = "하트형", 91
-            confidence_factors.append("넓은 이마, 좁은 턱")
-        else:
-            if abs(face_length_ratio - 1.3) < 0.1:
-                classification, confidence = "타원형", 94  # 계란형 → 타원형
-                confidence_factors.append("황금비율 1.3에 근사")
-            else:
-                classification, confidence = "타원형", 88  # 계란형 → 타원형
-                confidence_factors.append("균형잡힌 비율")
+    # 🔥 v7.1 분류 로직 (Firebase 파일명과 매핑): 비율별 구간 번호 → FACE_SHAPE_TABLE 조회
+    # 황금비율 구간(1.2~1.4)은 긴형/짧은형과 겹치지 않으므로 구간 번호를 산술로 합성
+    length_bin = (
+        3
+        - (np.abs(face_length_ratio - GOLDEN_FACE_RATIO) < GOLDEN_TOLERANCE)
+        - 2 * (face_length_ratio < SHORT_FACE_RATIO)
+        - 3 * (face_length_ratio > LONG_FACE_RATIO)
+    )
+    forehead_bin = (
+        (forehead_cheek_ratio >= NARROW_FOREHEAD_RATIO).astype(np.intp)
+        + (forehead_cheek_ratio > ROUND_FOREHEAD_RATIO)
+        + (forehead_cheek_ratio > WIDE_FOREHEAD_RATIO)
+    )
+    jaw_bin = (
+        (jaw_cheek_ratio >= DIAMOND_JAW_RATIO).astype(np.intp)
+        + (jaw_cheek_ratio >= LONG_NARROW_JAW_RATIO)
+        + (jaw_cheek_ratio > ROUND_JAW_RATIO)
+    )
+    return FACE_SHAPE_TABLE[length_bin, forehead_bin, jaw_bin]
+
+def build_classification_result(code: int, ratios) -> Dict[str, Any]:
+    """분류 코드와 비율 한 행([FL/CW, JW/CW, FW/CW])으로 응답용 분류 결과 구성"""
+    classification, confidence, _ = FACE_SHAPE_OUTCOMES[code]
+    face_length_ratio, jaw_cheek_ratio, forehead_cheek_ratio = (float(r) for r in ratios)
     
     return {
         "face_shape": classification,
@@ -455,130 +584,346 @@ def classify_face_shape_gpt_verified(measurements: Dict[str, float]) -> Dict[str
             "jaw_cheek_ratio": round(jaw_cheek_ratio, 3), 
             "forehead_cheek_ratio": round(forehead_cheek_ratio, 3)
         },
-        "confidence_factors": confidence_factors
+        "confidence_factors": FACE_SHAPE_FACTORS[code]
     }
 
-def extract_skin_color_rgb(image_np: np.ndarray, landmarks, width: int, height: int) -> Dict[str, Any]:
-    """퍼스널컬러 분석"""
-    try:
-        print("🎨 퍼스널컬러 분석 시작...")
+# ⚡ 단일 얼굴 분류 코어 (Numba 네이티브 코드, classify_face_shape_batch와 동일한 분기)
+# 명시적 시그니처라 import 시점에 즉시 컴파일되며, cache=True로 재시작시 캐시 로드
+# (fastmath 미사용: 역수 곱셈 근사가 임계값 경계에서 배치 분류와 결과를 다르게 만듦)
+@njit('int8(float32, float32, float32)', cache=True)
+def _classify_ratios(face_length_ratio, jaw_cheek_ratio, forehead_cheek_ratio):
+    # 임계값은 float32 전역 상수라 컴파일 시점에 상수로 고정되고 단정밀도로 비교됨
+    if face_length_ratio > LONG_FACE_RATIO:
+        code = 0 if jaw_cheek_ratio < LONG_NARROW_JAW_RATIO else 1
+    elif face_length_ratio < SHORT_FACE_RATIO:
+        code = 2 if (forehead_cheek_ratio > ROUND_FOREHEAD_RATIO and jaw_cheek_ratio > ROUND_JAW_RATIO) else 3
+    elif forehead_cheek_ratio < NARROW_FOREHEAD_RATIO:
+        code = 4 if jaw_cheek_ratio < DIAMOND_JAW_RATIO else 5
+    elif forehead_cheek_ratio > WIDE_FOREHEAD_RATIO:
+        code = 6
+    elif abs(face_length_ratio - GOLDEN_FACE_RATIO) < GOLDEN_TOLERANCE:
+        code = 7
+    else:
+        code = 8
+    
+    return np.int8(code)
+
+# 🗃️ 비율(정수 픽셀 좌표 간 거리로 계산해 같은 이미지면 완전히 동일) → 분류 결과 캐시
+# 재전송/재시도된 이미지는 JIT 호출과 결과 구성 없이 반환. 반환 dict는 읽기 전용으로 공유
+@functools.lru_cache(maxsize=4096)
+def classify_ratios_cached(face_length_ratio: float, jaw_cheek_ratio: float,
+                           forehead_cheek_ratio: float) -> Dict[str, Any]:
+    """(FL/CW, JW/CW, FW/CW) 비율로 얼굴형 분류 (결과 캐시, float32 값을 float로 받아 손실 없음)"""
+    ratios = (face_length_ratio, jaw_cheek_ratio, forehead_cheek_ratio)
+    code = _classify_ratios(*(np.float32(r) for r in ratios))
+    
+    logger.debug("📊 비율 분석: FL/CW=%.3f, JW/CW=%.3f, FW/CW=%.3f", *ratios)
+    
+    return build_classification_result(int(code), ratios)
+
+def classify_face_shape_gpt_verified(ratios: np.ndarray) -> Dict[str, Any]:
+    """GPT 검증된 해부학적 정확성 기반 얼굴형 분류 (단일 얼굴, JIT 코어 + 결과 캐시)
+
+    ratios는 extract_perfect_measurements 결과의 "ratios" (compute_face_ratios)입니다.
+    """
+    return classify_ratios_cached(*ratios.tolist())
+
+# 🎨 언더톤별 (기본 신뢰도, 최대 신뢰도, 추천 헤어컬러, 설명)
+# 신뢰도 = min(최대, 기본 + |R-B|) → 중성톤은 기본=최대라 항상 65
+UNDERTONE_PROFILES = {
+    "웜톤": (70, 85, ("골든브라운", "카라멜브라운", "허니블론드"),
+            "따뜻하고 황금빛이 도는 피부톤으로, 골든 계열 헤어컬러가 잘 어울려요"),
+    "쿨톤": (70, 85, ("애쉬브라운", "플래티넘블론드", "블랙브라운"),
+            "차가우면서 청량감 있는 피부톤으로, 애쉬 계열 헤어컬러가 잘 어울려요"),
+    "중성톤": (65, 65, ("내추럴브라운", "다크브라운", "소프트블랙"),
+             "균형잡힌 중성 피부톤으로, 다양한 헤어컬러가 어울려요"),
+}
+
+# 🎨 피부색 샘플링 랜드마크 (이마 중앙, 왼쪽 볼, 오른쪽 볼, 턱 중앙)
+SKIN_SAMPLE_INDICES = np.array([10, 123, 352, 175], dtype=np.int64)
+assert SKIN_SAMPLE_INDICES.max() < FACE_MESH_LANDMARK_COUNT, "피부색 샘플 인덱스가 FaceMesh 범위를 벗어남"
+
+# 📥 실제로 읽는 랜드마크 (측정 18개 + 피부색 4개, 중복 제외)만 배열로 복사하고, 각 용도의 행 번호를 미리 계산
+USED_LANDMARK_INDICES = np.union1d(LANDMARK_INDICES, SKIN_SAMPLE_INDICES).tolist()
+MEASURE_ROWS = np.searchsorted(USED_LANDMARK_INDICES, LANDMARK_INDICES)
+SKIN_SAMPLE_ROWS = np.searchsorted(USED_LANDMARK_INDICES, SKIN_SAMPLE_INDICES)
+
+# 🛟 피부색 분석 실패시 안전한 기본값 (읽기 전용으로 공유 - 응답 모델이 복사해서 검증)
+DEFAULT_PERSONAL_COLOR = {
+    "skin_rgb": [200, 180, 160],
+    "undertone": "웜톤",
+    "confidence": 50,
+    "recommended_hair_colors": ["내추럴브라운", "다크브라운"],
+    "description": "기본 웜톤으로 분류되었습니다",
+    "analysis_method": "fallback"
+}
+
+# ⚡ 샘플 포인트별 5x5 영역 RGB 평균의 평균 (Numba 네이티브 루프, 작은 NumPy 호출 반복 제거)
+# 반환: (R, G, B, 사용된 포인트 수) - 이미지 밖 포인트는 건너뜀
+@njit('Tuple((float64, float64, float64, int64))(uint8[:, :, :], int32[:, :])', cache=True)
+def _mean_skin_rgb(image, sample_xy):
+    height, width = image.shape[0], image.shape[1]
+    r_total, g_total, b_total = 0.0, 0.0, 0.0
+    sampled = 0
+    
+    for k in range(sample_xy.shape[0]):
+        x, y = sample_xy[k, 0], sample_xy[k, 1]
+        if x < 0 or x >= width or y < 0 or y >= height:
+            continue
+        
+        y_start, y_end = max(0, y - 2), min(height, y + 3)
+        x_start, x_end = max(0, x - 2), min(width, x + 3)
+        r_sum, g_sum, b_sum = 0.0, 0.0, 0.0
+        for yy in range(y_start, y_end):
+            for xx in range(x_start, x_end):
+                r_sum += image[yy, xx, 0]
+                g_sum += image[yy, xx, 1]
+                b_sum += image[yy, xx, 2]
         
-        # 이마, 양쪽 볼, 턱에서 피부색 샘플링
-        skin_points = [
-            landmarks[10],   # 이마 중앙
-            landmarks[123],  # 왼쪽 볼
-            landmarks[352],  # 오른쪽 볼
-            landmarks[175]   # 턱 중앙
-        ]
+        pixels = (y_end - y_start) * (x_end - x_start)
+        r_total += r_sum / pixels
+        g_total += g_sum / pixels
+        b_total += b_sum / pixels
+        sampled += 1
+    
+    if sampled == 0:
+        return 0.0, 0.0, 0.0, 0
+    return r_total / sampled, g_total / sampled, b_total / sampled, sampled
+
+def extract_skin_color_rgb(image_np: np.ndarray, landmark_array: np.ndarray, width: int, height: int) -> Dict[str, Any]:
+    """퍼스널컬러 분석 (landmark_array: landmarks_to_array 결과)"""
+    try:
+        logger.debug("🎨 퍼스널컬러 분석 시작...")
         
-        rgb_samples = []
+        # 이마, 양쪽 볼, 턱에서 피부색 샘플링 (4개 포인트 한 번에 gather + 픽셀 변환)
+        sample_xy = (
+            landmark_array[SKIN_SAMPLE_ROWS] * np.array([width, height], dtype=np.float32)
+        ).astype(np.int32)
         
-        for point in skin_points:
-            x = int(point.x * width)
-            y = int(point.y * height)
-            
-            # 경계값 체크
-            if 0 <= x < width and 0 <= y < height:
-                # 5x5 영역 평균으로 노이즈 감소
-                y_start, y_end = max(0, y-2), min(height, y+3)
-                x_start, x_end = max(0, x-2), min(width, x+3)
-                
-                region = image_np[y_start:y_end, x_start:x_end]
-                if region.size > 0:
-                    avg_rgb = np.mean(region, axis=(0,1))
-                    rgb_samples.append(avg_rgb)
+        # 5x5 영역 평균 → 포인트별 평균의 평균 (경계 밖 포인트 제외, JIT 루프 한 번)
+        r, g, b, sampled = _mean_skin_rgb(image_np, sample_xy)
         
-        if not rgb_samples:
+        if sampled == 0:
             raise Exception("피부색 샘플 추출 실패")
         
-        # 전체 평균 계산
-        final_rgb = np.mean(rgb_samples, axis=0)
-        r, g, b = final_rgb
-        
-        print(f"📊 피부색 RGB: R={r:.1f}, G={g:.1f}, B={b:.1f}")
+        logger.debug("📊 피부색 RGB: R=%.1f, G=%.1f, B=%.1f", r, g, b)
         
         # 🔥 웜톤/쿨톤 분류 알고리즘
         red_blue_diff = r - b
         
         if red_blue_diff > 5:
             undertone = "웜톤"
-            confidence = min(85, 70 + int(red_blue_diff))
-            recommended_colors = ["골든브라운", "카라멜브라운", "허니블론드"]
-            description = "따뜻하고 황금빛이 도는 피부톤으로, 골든 계열 헤어컬러가 잘 어울려요"
         elif red_blue_diff < -3:
-            undertone = "쿨톤"  
-            confidence = min(85, 70 + int(abs(red_blue_diff)))
-            recommended_colors = ["애쉬브라운", "플래티넘블론드", "블랙브라운"]
-            description = "차가우면서 청량감 있는 피부톤으로, 애쉬 계열 헤어컬러가 잘 어울려요"
+            undertone = "쿨톤"
         else:
             undertone = "중성톤"
-            confidence = 65
-            recommended_colors = ["내추럴브라운", "다크브라운", "소프트블랙"]
-            description = "균형잡힌 중성 피부톤으로, 다양한 헤어컬러가 어울려요"
         
-        print(f"✅ 퍼스널컬러 분석 완료: {undertone} ({confidence}%)")
+        base_confidence, max_confidence, recommended_colors, description = UNDERTONE_PROFILES[undertone]
+        confidence = min(max_confidence, base_confidence + int(abs(red_blue_diff)))
+        
+        logger.debug("✅ 퍼스널컬러 분석 완료: %s (%d%%)", undertone, confidence)
         
         return {
             "skin_rgb": [int(r), int(g), int(b)],
             "undertone": undertone,
             "confidence": confidence,
-            "recommended_hair_colors": recommended_colors,
+            "recommended_hair_colors": list(recommended_colors),
             "description": description,
             "analysis_method": "rgb_based_advanced"
         }
         
     except Exception as e:
-        print(f"⚠️ 퍼스널컬러 분석 실패: {e}")
-        # 안전한 기본값 반환
-        return {
-            "skin_rgb": [200, 180, 160],
-            "undertone": "웜톤",
-            "confidence": 50,
-            "recommended_hair_colors": ["내추럴브라운", "다크브라운"],
-            "description": "기본 웜톤으로 분류되었습니다",
-            "analysis_method": "fallback"
-        }
+        logger.warning("⚠️ 퍼스널컬러 분석 실패: %s", e)
+        return DEFAULT_PERSONAL_COLOR
+
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """MediaPipe 랜드마크 중 USED_LANDMARK_INDICES만 (K, 2) float32 배열(x, y 정규화 좌표)로 변환
+
+    468개 전체 대신 실제로 쓰는 행만 읽으며(MEASURE_ROWS / SKIN_SAMPLE_ROWS로 조회),
+    z는 사용하지 않으므로 읽지 않습니다. 좌표 축별로 np.fromiter로 바로 채웁니다.
+    """
+    used = [landmarks[i] for i in USED_LANDMARK_INDICES]
+    count = len(used)
+    landmark_array = np.empty((count, 2), dtype=np.float32)
+    landmark_array[:, 0] = np.fromiter((lm.x for lm in used), dtype=np.float32, count=count)
+    landmark_array[:, 1] = np.fromiter((lm.y for lm in used), dtype=np.float32, count=count)
+    return landmark_array
+
+# 🧵 워커 스레드별 재사용 이미지 버퍼 (추론 입력 최대 크기 MAX_INFERENCE_SIDE² × 3 바이트)
+# 요청마다 H×W×3 버퍼를 새로 할당하지 않도록 cvtColor/resize 결과를 여기에 기록.
+# 뷰는 같은 스레드의 다음 이미지 처리 전까지만 유효 (FaceMesh.process는 입력을 보관하지 않음)
+SCRATCH_CAPACITY = MAX_INFERENCE_SIDE * MAX_INFERENCE_SIDE * 3
+scratch_local = threading.local()
+
+def get_scratch_view(height: int, width: int):
+    """현재 스레드 전용 버퍼의 (height, width, 3) uint8 연속 뷰 (용량 초과시 None → 새로 할당)"""
+    size = height * width * 3
+    if size > SCRATCH_CAPACITY:
+        return None
+    
+    buffer = getattr(scratch_local, "buffer", None)
+    if buffer is None:
+        buffer = np.empty(SCRATCH_CAPACITY, dtype=np.uint8)
+        scratch_local.buffer = buffer
+    return buffer[:size].reshape(height, width, 3)
+
+def decode_jpeg_scaled(image_data: bytes) -> tuple:
+    """JPEG를 DCT 단계에서 축소하며 RGB로 디코딩
+
+    긴 변이 MAX_INFERENCE_SIDE 이상으로 남는 가장 작은 배율을 골라 디코딩 자체의
+    픽셀 수를 줄이고, 남은 축소는 resize_for_inference(INTER_AREA)가 마무리합니다.
+    (RGB 배열, 원본 (width, height))을 반환합니다.
+    """
+    width, height, _, _ = turbo_jpeg.decode_header(image_data)
+    long_side = max(width, height)
+    
+    scaling_factor = next(
+        (factor for factor in JPEG_DOWNSCALE_FACTORS
+         if long_side * factor[0] / factor[1] >= MAX_INFERENCE_SIDE),
+        None
+    )
+    rgb = turbo_jpeg.decode(image_data, pixel_format=TJPF_RGB, scaling_factor=scaling_factor)
+    return rgb, (width, height)
+
+def decode_image_pil(image_data: bytes) -> tuple:
+    """cv2.imdecode가 읽지 못한 업로드를 PIL로 디코딩 (GIF는 첫 프레임)
+
+    (RGB 배열, 원본 (width, height))을 반환하며, PIL도 읽지 못하면 ValueError를 발생시킵니다.
+    축소는 resize_for_inference가 처리합니다.
+    """
+    try:
+        with Image.open(io.BytesIO(image_data)) as image:
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            # 쓰기 가능한 연속 배열로 복사 (읽기 전용 배열은 JIT 샘플링 시그니처와 맞지 않음)
+            rgb = np.array(image)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ValueError("지원하지 않거나 손상된 이미지 파일입니다") from e
+    
+    return rgb, (rgb.shape[1], rgb.shape[0])
+
+def decode_image(image_data: bytes) -> tuple:
+    """업로드 바이트(bytes 또는 mmap 버퍼)를 RGB uint8 배열로 디코딩
+
+    JPEG는 TurboJPEG로 RGB 직접(필요시 DCT 축소) 디코딩, 그 외(PNG 등)는
+    cv2.imdecode 후 INTER_AREA 축소를 먼저 하고 cvtColor. OpenCV가 읽지 못하는
+    형식(GIF 등)은 PIL로 디코딩합니다. (RGB 배열, 원본 (width, height))을 반환하며,
+    디코딩할 수 없는 데이터면 ValueError를 발생시킵니다.
+    """
+    # 빈 버퍼는 cv2.imdecode가 None 대신 assertion(cv2.error)을 던지므로 먼저 거름
+    if not image_data:
+        raise ValueError("빈 이미지 파일입니다")
+    
+    if turbo_jpeg is not None and image_data[:3] == JPEG_MAGIC:
+        try:
+            return decode_jpeg_scaled(image_data)
+        except OSError as e:
+            logger.debug("⚠️ TurboJPEG 디코딩 실패, OpenCV로 재시도: %s", e)
+    
+    # EXIF 회전은 TurboJPEG 경로와 동일하게 적용하지 않음
+    bgr = cv2.imdecode(
+        np.frombuffer(image_data, dtype=np.uint8),
+        cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+    )
+    if bgr is None:
+        return decode_image_pil(image_data)
+    
+    original_size = (bgr.shape[1], bgr.shape[0])
+    
+    # 색변환 전에 축소해서 cvtColor가 최대 MAX_INFERENCE_SIDE² 픽셀만 처리하도록 함
+    # (스크래치 버퍼는 cvtColor 출력용이므로 여기서는 새 배열로 축소)
+    scale = MAX_INFERENCE_SIDE / max(original_size)
+    if scale < 1.0:
+        bgr = cv2.resize(
+            bgr,
+            (max(1, int(original_size[0] * scale)), max(1, int(original_size[1] * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+    
+    height, width = bgr.shape[:2]
+    rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=get_scratch_view(height, width))
+    return rgb, original_size
+
+def resize_for_inference(image_np: np.ndarray) -> tuple:
+    """긴 변이 MAX_INFERENCE_SIDE를 넘는 이미지를 INTER_AREA로 축소
 
-def extract_perfect_measurements(image_np: np.ndarray, landmarks) -> Dict[str, Any]:
-    """GPT 검증된 해부학적 정확성 기반 측정"""
+    (축소된 이미지, 적용된 배율)을 반환합니다. 축소가 필요 없으면 배율은 1.0입니다.
+    """
+    height, width = image_np.shape[:2]
+    scale = MAX_INFERENCE_SIDE / max(height, width)
+    
+    if scale >= 1.0:
+        return image_np, 1.0
+    
+    new_width, new_height = max(1, int(width * scale)), max(1, int(height * scale))
+
+    # 입력이 이미 스크래치 버퍼 위에 있으면 출력 뷰와 겹치므로 새 배열로 축소
+    # (cv2.resize는 겹침을 검사하지 않고 줄 단위 병렬 처리 중 원본 행을 덮어씀)
+    scratch = getattr(scratch_local, "buffer", None)
+    dst = None
+    if scratch is None or not np.shares_memory(image_np, scratch):
+        dst = get_scratch_view(new_height, new_width)
+
+    resized = cv2.resize(
+        image_np,
+        (new_width, new_height),
+        dst=dst,
+        interpolation=cv2.INTER_AREA
+    )
+    return resized, scale
+
+# ⚡ 측정 코어 (Numba 네이티브 코드): 18개 포인트 픽셀 변환 → 4대 거리를 한 번에
+# 명시적 시그니처라 import 시점에 컴파일되어(cache=True) 첫 요청에 JIT 비용이 없음
+# 반환: (픽셀 좌표 (18, 2) int32, [FW, CW, JW, FC] float32)
+@njit('Tuple((int32[:, :], float32[:]))(float32[:, :], int64[:], int64[:], int64[:], float32, float32)',
+      cache=True)
+def _measure_face(landmark_array, measure_rows, start_rows, end_rows, coord_width, coord_height):
+    pixel_xy = np.empty((measure_rows.shape[0], 2), dtype=np.int32)
+    for k in range(measure_rows.shape[0]):
+        # 정규화 좌표 × 원본 크기를 float32로 곱한 뒤 0 방향 절사 (astype(np.int32)와 동일)
+        pixel_xy[k, 0] = np.int32(landmark_array[measure_rows[k], 0] * coord_width)
+        pixel_xy[k, 1] = np.int32(landmark_array[measure_rows[k], 1] * coord_height)
+    
+    widths = np.empty(start_rows.shape[0], dtype=np.float32)
+    for k in range(start_rows.shape[0]):
+        dx = np.float32(pixel_xy[start_rows[k], 0] - pixel_xy[end_rows[k], 0])
+        dy = np.float32(pixel_xy[start_rows[k], 1] - pixel_xy[end_rows[k], 1])
+        widths[k] = np.hypot(dx, dy)
+    
+    return pixel_xy, widths
+
+def extract_perfect_measurements(image_np: np.ndarray, landmarks, include_landmarks: bool = False,
+                                 original_size: tuple = None) -> Dict[str, Any]:
+    """GPT 검증된 해부학적 정확성 기반 측정
+
+    include_landmarks가 False이면 18개 랜드마크 좌표(landmark_coordinates)는
+    결과에서 생략합니다.
+    original_size(width, height)가 주어지면 축소 전 원본 이미지 기준 픽셀로 측정합니다.
+    """
     
     height, width = image_np.shape[:2]
     
-    def get_landmark_coords(idx: int) -> tuple:
-        landmark = landmarks[idx]
-        return int(landmark.x * width), int(landmark.y * height)
+    # 랜드마크는 정규화 좌표이므로 원본 크기를 곱하면 원본 픽셀 공간으로 복원됨
+    coord_width, coord_height = original_size if original_size else (width, height)
     
     try:
-        # 🎯 GPT 검증 완료: 18개 핵심 포인트 추출
-        coords = {}
-        for name, idx in PERFECT_LANDMARKS.items():
-            coords[name] = get_landmark_coords(idx)
-        
-        # 📏 4대 핵심 측정값 (해부학적 정확성 보장)
-        
-        # 1. 이마 폭 (FW): 양쪽 관자놀이 최외곽점
-        FW = math.sqrt((coords['temple_left'][0] - coords['temple_right'][0])**2 + 
-                      (coords['temple_left'][1] - coords['temple_right'][1])**2)
-        
-        # 2. 광대뼈 폭 (CW): 가장 넓은 부분
-        CW = math.sqrt((coords['cheekbone_left'][0] - coords['cheekbone_right'][0])**2 + 
-                      (coords['cheekbone_left'][1] - coords['cheekbone_right'][1])**2)
-        
-        # 3. 턱 폭 (JW): 턱선 가장 넓은 부분  
-        JW = math.sqrt((coords['jaw_left'][0] - coords['jaw_right'][0])**2 + 
-                      (coords['jaw_left'][1] - coords['jaw_right'][1])**2)
-        
-        # 4. 얼굴 길이 (FC): 이마 상단에서 턱 끝까지
-        FC = math.sqrt((coords['face_top'][0] - coords['chin_center'][0])**2 + 
-                      (coords['face_top'][1] - coords['chin_center'][1])**2)
+        # 🎯 GPT 검증 완료: 18개 핵심 포인트 픽셀 변환 + 📏 4대 핵심 측정값 (JIT 코어 한 번)
+        landmark_array = landmarks_to_array(landmarks)
+        pixel_xy, widths = _measure_face(
+            landmark_array, MEASURE_ROWS, MEASURE_START_ROWS, MEASURE_END_ROWS,
+            np.float32(coord_width), np.float32(coord_height)
+        )
+        coords = dict(zip(LANDMARK_NAMES, map(tuple, pixel_xy.tolist()))) if include_landmarks else None
+        FW, CW, JW, FC = widths.tolist()
         
-        print(f"📏 측정 완료: FW={FW:.1f}px, CW={CW:.1f}px, JW={JW:.1f}px, FC={FC:.1f}px")
+        logger.debug("📏 측정 완료: FW=%.1fpx, CW=%.1fpx, JW=%.1fpx, FC=%.1fpx", FW, CW, JW, FC)
         
         # 🎨 퍼스널컬러 분석
-        skin_analysis = extract_skin_color_rgb(image_np, landmarks, width, height)
+        skin_analysis = extract_skin_color_rgb(image_np, landmark_array, width, height)
         
         return {
-            "FW": FW, "CW": CW, "JW": JW, "FC": FC,
+            # 분류 비율 [FL/CW, JW/CW, FW/CW]: 여기서 한 번 계산해 단일/배치 분류가 그대로 사용
+            "ratios": compute_face_ratios(widths),
             "method": "gpt_verified_perfect",
             "measurements": {
                 "foreheadWidthPx": round(FW, 1),
@@ -596,100 +941,368 @@ def extract_perfect_measurements(image_np: np.ndarray, landmarks) -> Dict[str, A
         }
         
     except Exception as e:
-        print(f"❌ 측정 실패: {e}")
-        traceback.print_exc()
+        logger.exception("❌ 측정 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"측정 처리 실패: {str(e)}")
 
-@app.post("/analyze-face/")
-async def analyze_face_endpoint(file: UploadFile = File(...)):
-    """v7.1 Final: 실제 Firebase 파일명 기반 헤어스타일 추천"""
+def detect_and_measure(image_data: bytes, include_landmarks: bool = False):
+    """디코딩 → MediaPipe 감지 → 정밀 측정 (워커 스레드용 동기 파이프라인)
+
+    측정 결과를 반환하고, 얼굴이 감지되지 않으면 None을 반환합니다.
+    디코딩할 수 없는 이미지면 ValueError가 전파됩니다.
+    """
+    image_np, original_size = decode_image(image_data)
     
-    print(f"🎯 HAIRGATOR v7.1 실제 Firebase 파일 기반 분석 시작: {file.filename}")
+    # 📉 고해상도 업로드는 MediaPipe 추론 전에 축소
+    image_np, _ = resize_for_inference(image_np)
+    logger.debug("📷 이미지 로드: 원본 %s → 추론 입력 %s", original_size, image_np.shape)
     
-    try:
-        # 🖼️ 이미지 로드 및 전처리
-        image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
+    # 🤖 MediaPipe 얼굴 감지 (스레드 전용 FaceMesh)
+    # 연속 uint8 배열이면 ImageFrame이 추가 변환 없이 받음 (디코딩/축소 경로는 이미 연속이라 복사 없음)
+    image_np = np.ascontiguousarray(image_np, dtype=np.uint8)
+    results = get_face_mesh().process(image_np)
+    
+    if not results.multi_face_landmarks:
+        return None
+    
+    landmarks = results.multi_face_landmarks[0].landmark
+    logger.debug("✅ MediaPipe 감지 성공: %d개 랜드마크", len(landmarks))
+    
+    # 📏 정밀 측정 실행
+    return extract_perfect_measurements(image_np, landmarks, include_landmarks, original_size)
+
+def analyze_image(image_data: bytes, include_landmarks: bool = False):
+    """단일 이미지 분석: (측정 결과, 분류 결과) 또는 얼굴 미감지시 None"""
+    measurement_result = detect_and_measure(image_data, include_landmarks)
+    
+    if measurement_result is None:
+        return None
+    
+    # 🎯 얼굴형 분류 (측정 단계에서 계산한 비율 재사용)
+    return measurement_result, classify_face_shape_gpt_verified(measurement_result["ratios"])
+
+def analyze_image_batch(requests: list) -> list:
+    """(image_data, include_landmarks) 목록을 한 워커에서 순차 감지 후 벡터화 분류
+
+    요청 순서대로 analyze_image와 같은 결과(또는 해당 요청의 예외 객체)를 담은 목록을 반환합니다.
+    """
+    outcomes = []
+    for image_data, include_landmarks in requests:
+        try:
+            outcomes.append(detect_and_measure(image_data, include_landmarks))
+        except Exception as e:
+            outcomes.append(e)
+    
+    measured = [i for i, outcome in enumerate(outcomes) if isinstance(outcome, dict)]
+    if measured:
+        ratios = np.stack([outcomes[i]["ratios"] for i in measured])
+        codes = classify_face_shape_batch(ratios)
+        for row, i in enumerate(measured):
+            outcomes[i] = (outcomes[i], build_classification_result(int(codes[row]), ratios[row]))
+    
+    return outcomes
+
+# 📦 마이크로 배칭 (BATCHING=1일 때만): MAX_WAIT_MS 안에 도착한 요청을 최대 MAX_BATCH개씩 묶어 처리
+BATCHING_ENABLED = os.environ.get("BATCHING") == "1"
+MAX_BATCH = 8
+MAX_WAIT_MS = 10
+analysis_queue = None
+analysis_batcher_task = None
+
+def resolve_analysis_batch(pending: list, batch_future) -> None:
+    """배치 결과를 각 요청의 future에 전달"""
+    if batch_future.exception() is not None:
+        outcomes = [batch_future.exception()] * len(pending)
+    else:
+        outcomes = batch_future.result()
+    
+    for future, outcome in zip(pending, outcomes):
+        if future.done():  # 클라이언트 연결 종료 등으로 취소된 요청
+            continue
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_result(outcome)
+
+async def run_analysis_batcher():
+    """큐에서 요청을 모아 워커 풀에 배치 단위로 제출 (완료를 기다리지 않고 다음 배치 수집)"""
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        batch = [await analysis_queue.get()]
         
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        # 첫 요청 이후 MAX_WAIT_MS 동안 추가 요청을 기다림 (이미 가득 찼으면 바로 제출)
+        if analysis_queue.qsize() < MAX_BATCH - 1:
+            await asyncio.sleep(MAX_WAIT_MS / 1000)
         
-        image_np = np.array(image)
-        print(f"📷 이미지 로드: {image_np.shape}")
+        while len(batch) < MAX_BATCH and not analysis_queue.empty():
+            batch.append(analysis_queue.get_nowait())
         
-        # 🤖 MediaPipe 얼굴 감지
-        with mp_face_mesh.FaceMesh(
-            static_image_mode=True,
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.7
-        ) as face_mesh:
-            
-            results = face_mesh.process(image_np)
-            
-            if not results.multi_face_landmarks:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "status": "error",
-                        "message": "얼굴을 감지할 수 없습니다. 조명이 밝은 곳에서 정면을 향해 다시 촬영해주세요.",
-                        "error_code": "NO_FACE_DETECTED"
-                    }
-                )
-            
-            landmarks = results.multi_face_landmarks[0].landmark
-            print(f"✅ MediaPipe 감지 성공: {len(landmarks)}개 랜드마크")
-            
-            # 📏 정밀 측정 실행
-            measurement_result = extract_perfect_measurements(image_np, landmarks)
-            
-            # 🎯 얼굴형 분류
-            measurements = {
-                'FW': measurement_result['FW'],
-                'CW': measurement_result['CW'], 
-                'JW': measurement_result['JW'],
-                'FC': measurement_result['FC']
+        logger.debug("📦 분석 배치 제출: %d건", len(batch))
+        batch_future = loop.run_in_executor(
+            analysis_executor, analyze_image_batch,
+            [(image_data, include_landmarks) for image_data, include_landmarks, _ in batch]
+        )
+        batch_future.add_done_callback(
+            functools.partial(resolve_analysis_batch, [future for *_, future in batch])
+        )
+
+async def submit_analysis(image_data: bytes, include_landmarks: bool):
+    """분석 요청 제출: 배칭 활성화시 배처 큐, 아니면 워커 풀에 직접 실행"""
+    loop = asyncio.get_running_loop()
+    
+    if not BATCHING_ENABLED:
+        return await loop.run_in_executor(analysis_executor, analyze_image, image_data, include_landmarks)
+    
+    future = loop.create_future()
+    await analysis_queue.put((image_data, include_landmarks, future))
+    return await future
+
+@app.on_event("startup")
+async def start_analysis_batcher():
+    """BATCHING=1이면 배치 큐와 백그라운드 배처 시작"""
+    global analysis_queue, analysis_batcher_task
+    
+    if BATCHING_ENABLED:
+        analysis_queue = asyncio.Queue()
+        analysis_batcher_task = asyncio.create_task(run_analysis_batcher())
+        logger.info("📦 마이크로 배칭 활성화 (최대 %d건 / %dms)", MAX_BATCH, MAX_WAIT_MS)
+
+def warm_up_analysis_worker(barrier: threading.Barrier):
+    """워커 스레드 하나의 FaceMesh를 미리 생성/워밍업
+
+    barrier에서 모든 워밍업 작업이 모일 때까지 대기하므로 한 스레드가 두 작업을
+    가져가지 않고, 풀의 모든 워커에 한 번씩 분산됩니다.
+    """
+    get_face_mesh()
+    try:
+        barrier.wait(timeout=30)
+    except threading.BrokenBarrierError:
+        logger.warning("⚠️ 일부 분석 워커 워밍업 대기 시간 초과")
+
+# 🚦 준비 상태 (워밍업 완료 전에는 분석 엔드포인트가 503, /health 등은 바로 응답)
+analysis_ready = False
+analysis_warmup_task = None
+
+async def warm_up_analysis_workers():
+    """모든 분석 워커 스레드에 FaceMesh를 미리 생성 (첫 요청의 그래프 초기화 지연 제거)"""
+    global analysis_ready
+    
+    loop = asyncio.get_running_loop()
+    barrier = threading.Barrier(ANALYSIS_WORKERS)
+    try:
+        await asyncio.gather(*(
+            loop.run_in_executor(analysis_executor, warm_up_analysis_worker, barrier)
+            for _ in range(ANALYSIS_WORKERS)
+        ))
+        logger.info("🔥 분석 워커 %d개 FaceMesh 워밍업 완료", ANALYSIS_WORKERS)
+    except Exception as e:
+        # 워밍업 실패해도 FaceMesh는 첫 요청에서 지연 생성되므로 서비스는 계속
+        logger.exception("⚠️ FaceMesh 워밍업 실패: %s", e)
+    finally:
+        analysis_ready = True
+
+@app.on_event("startup")
+async def start_analysis_warmup():
+    """FaceMesh 워밍업을 백그라운드로 시작 (서버는 즉시 요청을 받기 시작)"""
+    global analysis_warmup_task
+    analysis_warmup_task = asyncio.create_task(warm_up_analysis_workers())
+
+def warming_up_response() -> ORJSONResponse:
+    """워밍업 중 응답 (503 + Retry-After)"""
+    return ORJSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content={
+            "status": "error",
+            "message": "분석 엔진을 준비 중입니다. 잠시 후 다시 시도해주세요.",
+            "error_code": "WARMING_UP"
+        }
+    )
+
+NO_FACE_MESSAGE = "얼굴을 감지할 수 없습니다. 조명이 밝은 곳에서 정면을 향해 다시 촬영해주세요."
+FILE_TOO_LARGE_MESSAGE = f"이미지 파일이 너무 큽니다. 최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다."
+
+def build_analyze_data(measurement_result: Dict[str, Any], classification_result: Dict[str, Any],
+                       hairstyle_recommendations: list) -> AnalyzeData:
+    """측정/분류 결과와 추천 목록으로 응답 데이터 구성"""
+    return AnalyzeData(
+        face_shape=classification_result["face_shape"],
+        confidence=classification_result["confidence"],
+        personal_color=measurement_result["personal_color"],
+        recommended_hairstyles=hairstyle_recommendations,
+        measurements=measurement_result["measurements"],
+        ratios=classification_result["ratios"],
+        confidence_factors=classification_result["confidence_factors"],
+        analysis_version="v7.2_auto_firebase_detection",
+        total_recommendations=len(hairstyle_recommendations),
+        firebase_integration=FirebaseIntegration(
+            status="auto_detection_active",
+            total_files_mapped=sum(len(style["firebase_files"]) for style in hairstyle_recommendations),
+            file_naming_pattern="XXX_스타일명_얼굴형_연령대_변형.jpg.jpg",
+            auto_update="5분마다 자동 갱신"
+        ),
+        # 📍 랜드마크 좌표는 요청한 경우에만 포함 (기본 응답 크기 최소화)
+        landmark_coordinates=measurement_result["landmark_coordinates"]
+    )
+
+# 📮 Starlette 멀티파트 파서의 SpooledTemporaryFile 한도 (이보다 큰 업로드만 디스크로 넘어감)
+UPLOAD_SPOOL_MAX_BYTES = 1024 * 1024
+
+def map_upload(upload: UploadFile) -> Optional[mmap.mmap]:
+    """디스크로 넘어간 업로드(UPLOAD_SPOOL_MAX_BYTES 초과)를 읽기 전용 mmap으로 반환
+
+    힙으로 복사하지 않고 디코더가 페이지 캐시를 바로 읽게 합니다.
+    메모리에 있는 작은 업로드나 빈 파일이면 None을 반환합니다.
+    """
+    # SpooledTemporaryFile.fileno()는 메모리 파일을 디스크로 옮기므로(rollover) 한도 이하면 먼저 제외
+    # (Starlette의 1MB spool 한도에 의존 - 한도가 바뀌면 mmap 대신 읽기로 처리될 뿐 결과는 같음)
+    if upload.size is not None and upload.size <= UPLOAD_SPOOL_MAX_BYTES:
+        return None
+    
+    spooled = upload.file
+    try:
+        fileno = spooled.fileno()
+    except (io.UnsupportedOperation, AttributeError):
+        return None  # 파일 디스크립터가 없는 메모리 파일
+    
+    try:
+        spooled.flush()
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+def release_upload_map(mapped: Optional[mmap.mmap]) -> None:
+    """map_upload 결과 해제 (아직 참조하는 배열이 있으면 GC에 맡김)"""
+    if mapped is None:
+        return
+    try:
+        mapped.close()
+    except BufferError:
+        logger.debug("⚠️ 업로드 mmap 참조가 남아 있어 GC에 해제를 맡김")
+
+async def read_upload(upload: UploadFile) -> tuple:
+    """업로드 내용을 (이미지 버퍼, 해제할 mmap 또는 None)으로 반환
+
+    디스크 spool이면 mmap 뷰(복사 없음, len으로 크기 확인), 아니면 한도+1 바이트까지만 읽습니다.
+    """
+    mapped = map_upload(upload)
+    if mapped is not None:
+        return mapped, mapped
+    return await upload.read(MAX_UPLOAD_BYTES + 1), None
+
+def upload_too_large_response() -> ORJSONResponse:
+    """업로드 크기 초과 응답 (413)"""
+    return ORJSONResponse(
+        status_code=413,
+        content={
+            "status": "error",
+            "message": FILE_TOO_LARGE_MESSAGE,
+            "error_code": "FILE_TOO_LARGE"
+        }
+    )
+
+# 📮 멀티파트 경계/파트 헤더용 여유 (파일당, 한도 바로 아래 파일이 본문 크기로 거절되지 않도록)
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# 📮 본문 수신 전 헤더 검증 대상 경로 → 요청 본문 최대 크기 (UploadGuardMiddleware)
+UPLOAD_BODY_LIMITS = {
+    "/analyze-face/": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    "/analyze-faces/": (MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES) * MAX_BATCH_FILES,
+}
+
+def check_upload_headers(headers: Headers, max_body_bytes: int) -> Optional[ORJSONResponse]:
+    """multipart가 아니면 415, Content-Length가 한도를 넘으면 413 응답을 반환 (통과시 None)
+
+    Content-Length가 없는 chunked 업로드는 통과시키고 read_upload의 크기 확인에 맡깁니다.
+    """
+    # 미디어 타입은 대소문자를 구분하지 않음 (RFC 7231)
+    if not headers.get("content-type", "").lower().startswith("multipart/form-data"):
+        return ORJSONResponse(
+            status_code=415,
+            content={
+                "status": "error",
+                "message": "multipart/form-data 형식으로 이미지 파일을 업로드해주세요.",
+                "error_code": "UNSUPPORTED_MEDIA_TYPE"
             }
-            
-            classification_result = classify_face_shape_gpt_verified(measurements)
-            
-            # 🔥 자동 감지 Firebase 파일 기반 헤어스타일 추천
-            hairstyle_recommendations = await get_auto_recommendations(
-                face_shape=classification_result["face_shape"],
-                age_group="1020대"  # 기본값, 추후 연령 분석 추가 가능
+        )
+    
+    content_length = headers.get("content-length", "0")
+    if content_length.isdigit() and int(content_length) > max_body_bytes:
+        return upload_too_large_response()
+    return None
+
+@app.post("/analyze-face/", response_model=AnalyzeResponse, response_model_exclude_none=True)
+async def analyze_face_endpoint(file: UploadFile = File(...), include_landmarks: bool = False):
+    """v7.1 Final: 실제 Firebase 파일명 기반 헤어스타일 추천
+
+    ?include_landmarks=true 인 경우에만 18개 랜드마크 좌표를 응답에 포함합니다.
+    MAX_UPLOAD_BYTES를 넘는 업로드는 디코딩 없이 413으로 거절합니다
+    (Content-Length/Content-Type은 UploadGuardMiddleware가 본문 수신 전에 확인).
+    """
+    
+    logger.debug("🎯 HAIRGATOR v7.1 실제 Firebase 파일 기반 분석 시작: %s", file.filename)
+    
+    if not analysis_ready:
+        return warming_up_response()
+    
+    try:
+        # 🖼️ 이미지 로드 (디스크 spool은 mmap / 메모리는 한도+1 바이트까지만)
+        image_data, mapped = await read_upload(file)
+        if len(image_data) > MAX_UPLOAD_BYTES:
+            release_upload_map(mapped)
+            return upload_too_large_response()
+        
+        # 🤖 디코딩 → MediaPipe → 측정 → 분류는 워커 스레드에서 실행 (이벤트 루프 비차단)
+        try:
+            analysis = await submit_analysis(image_data, include_landmarks)
+        except ValueError as e:
+            return ORJSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "message": str(e),
+                    "error_code": "INVALID_IMAGE"
+                }
             )
-            
-            # 📊 최종 결과 구성
-            result = {
-                "status": "success",
-                "data": {
-                    "face_shape": classification_result["face_shape"],
-                    "confidence": classification_result["confidence"],
-                    "personal_color": measurement_result["personal_color"],
-                    "recommended_hairstyles": hairstyle_recommendations,
-                    "measurements": measurement_result["measurements"],
-                    "ratios": classification_result["ratios"],
-                    "confidence_factors": classification_result["confidence_factors"],
-                    "analysis_version": "v7.2_auto_firebase_detection",
-                    "total_recommendations": len(hairstyle_recommendations),
-                    "firebase_integration": {
-                        "status": "auto_detection_active",
-                        "total_files_mapped": sum(len(style["firebase_files"]) for style in hairstyle_recommendations),
-                        "file_naming_pattern": "XXX_스타일명_얼굴형_연령대_변형.jpg.jpg",
-                        "auto_update": "5분마다 자동 갱신"
-                    }
+        finally:
+            release_upload_map(mapped)
+        
+        if analysis is None:
+            return ORJSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "message": NO_FACE_MESSAGE,
+                    "error_code": "NO_FACE_DETECTED"
                 }
-            }
-            
-            print(f"🎉 자동 감지 Firebase 파일 기반 분석 완료: {classification_result['face_shape']} → {len(hairstyle_recommendations)}개 스타일")
-            
-            return JSONResponse(content=result)
+            )
+        
+        measurement_result, classification_result = analysis
+        
+        # 🔥 자동 감지 Firebase 파일 기반 헤어스타일 추천
+        hairstyle_recommendations = await get_auto_recommendations(
+            face_shape=classification_result["face_shape"],
+            age_group="1020대"  # 기본값, 추후 연령 분석 추가 가능
+        )
+        
+        # 📊 최종 결과 구성
+        result = AnalyzeResponse(
+            status="success",
+            data=build_analyze_data(measurement_result, classification_result, hairstyle_recommendations)
+        )
+        
+        logger.debug("🎉 자동 감지 Firebase 파일 기반 분석 완료: %s → %d개 스타일", classification_result["face_shape"], len(hairstyle_recommendations))
+        
+        # pydantic-core로 바로 JSON 직렬화 (jsonable_encoder 재귀 변환 생략)
+        return Response(
+            content=result.model_dump_json(exclude_none=True),
+            media_type="application/json"
+        )
             
     except Exception as e:
-        print(f"❌ 분석 실패: {e}")
-        traceback.print_exc()
+        logger.exception("❌ 분석 실패: %s", e)
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "status": "error", 
@@ -698,18 +1311,129 @@ async def analyze_face_endpoint(file: UploadFile = File(...)):
             }
         )
 
+async def run_analysis_chunks(requests: list) -> list:
+    """(image_data, include_landmarks) 목록을 워커 수만큼 나눠 analyze_image_batch로 병렬 실행
+
+    청크마다 감지 후 벡터화 분류(classify_face_shape_batch)를 한 번에 수행하며,
+    결과는 요청 순서대로 analyze_image_batch와 같은 형식으로 반환합니다.
+    """
+    if not requests:
+        return []
+    
+    loop = asyncio.get_running_loop()
+    chunk_size = -(-len(requests) // ANALYSIS_WORKERS)
+    chunk_outcomes = await asyncio.gather(*(
+        loop.run_in_executor(analysis_executor, analyze_image_batch, requests[start:start + chunk_size])
+        for start in range(0, len(requests), chunk_size)
+    ))
+    return [outcome for outcomes in chunk_outcomes for outcome in outcomes]
+
+async def build_batch_item(filename: Optional[str], outcome) -> BatchAnalyzeItem:
+    """analyze_image_batch 결과 하나를 /analyze-faces/ 항목으로 변환 (실패는 status="error")"""
+    if isinstance(outcome, ValueError):
+        return BatchAnalyzeItem(filename=filename, status="error", message=str(outcome), error_code="INVALID_IMAGE")
+    
+    if isinstance(outcome, Exception):
+        logger.error("❌ 배치 항목 분석 실패: %s", filename, exc_info=outcome)
+        return BatchAnalyzeItem(
+            filename=filename, status="error",
+            message=f"서버 처리 중 오류가 발생했습니다: {str(outcome)}", error_code="ANALYSIS_FAILED"
+        )
+    
+    if outcome is None:
+        return BatchAnalyzeItem(filename=filename, status="error", message=NO_FACE_MESSAGE, error_code="NO_FACE_DETECTED")
+    
+    measurement_result, classification_result = outcome
+    hairstyle_recommendations = await get_auto_recommendations(
+        face_shape=classification_result["face_shape"],
+        age_group="1020대"
+    )
+    return BatchAnalyzeItem(
+        filename=filename, status="success",
+        data=build_analyze_data(measurement_result, classification_result, hairstyle_recommendations)
+    )
+
+@app.post("/analyze-faces/", response_model=BatchAnalyzeResponse, response_model_exclude_none=True)
+async def analyze_faces_endpoint(files: List[UploadFile] = File(...), include_landmarks: bool = False):
+    """여러 얼굴 이미지를 한 번에 분석 (결과는 업로드 순서대로)
+
+    이미지를 워커 수만큼의 청크로 나눠 병렬 처리하므로 한 청크의 디코딩이 다른 청크의
+    MediaPipe 추론과 겹치고, 청크 안의 얼굴형은 벡터화 분류로 한 번에 계산됩니다.
+    이미지별 실패는 해당 항목의 status="error"로만 표시됩니다.
+    """
+    
+    if not analysis_ready:
+        return warming_up_response()
+    
+    if len(files) > MAX_BATCH_FILES:
+        return ORJSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "message": f"한 번에 최대 {MAX_BATCH_FILES}장까지 분석할 수 있습니다.",
+                "error_code": "TOO_MANY_FILES"
+            }
+        )
+    
+    try:
+        uploads = [(file.filename, *await read_upload(file)) for file in files]
+        
+        # 크기 초과 파일은 디코딩 없이 제외하고 나머지만 워커 풀에서 분석
+        try:
+            accepted = [i for i, (_, image_data, _) in enumerate(uploads) if len(image_data) <= MAX_UPLOAD_BYTES]
+            outcomes = await run_analysis_chunks([(uploads[i][1], include_landmarks) for i in accepted])
+            outcome_by_index = dict(zip(accepted, outcomes))
+        finally:
+            for _, _, mapped in uploads:
+                release_upload_map(mapped)
+        
+        items = []
+        for i, (filename, _, _) in enumerate(uploads):
+            if i not in outcome_by_index:
+                items.append(BatchAnalyzeItem(
+                    filename=filename, status="error",
+                    message=FILE_TOO_LARGE_MESSAGE,
+                    error_code="FILE_TOO_LARGE"
+                ))
+            else:
+                items.append(await build_batch_item(filename, outcome_by_index[i]))
+        
+        result = BatchAnalyzeResponse(
+            status="success",
+            total_files=len(items),
+            total_analyzed=sum(item.status == "success" for item in items),
+            results=items
+        )
+        return Response(
+            content=result.model_dump_json(exclude_none=True),
+            media_type="application/json"
+        )
+    
+    except Exception as e:
+        logger.exception("❌ 배치 분석 실패: %s", e)
+        
+        return ORJSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": f"서버 처리 중 오류가 발생했습니다: {str(e)}",
+                "error_code": "ANALYSIS_FAILED"
+            }
+        )
+
 @app.get("/")
 async def root():
     return {
         "service": "HAIRGATOR Face Analysis API",
         "version": "v7.2 Auto Firebase Detection",
         "features": ["MediaPipe 얼굴형 분석", "자동 Firebase 파일 감지 헤어스타일 추천", "퍼스널컬러 분석"],
-        "status": "ready",
+        "status": "ready" if analysis_ready else "warming_up",
         "firebase_connected": True,
         "auto_detection": "활성화 (5분마다 갱신)",
         "current_files_available": "자동 감지된 모든 업로드 파일",
         "endpoints": {
-            "POST /analyze-face/": "얼굴형 분석 + 자동 감지 Firebase 헤어스타일 추천"
+            "POST /analyze-face/": "얼굴형 분석 + 자동 감지 Firebase 헤어스타일 추천",
+            "POST /analyze-faces/": f"여러 이미지 일괄 분석 (최대 {MAX_BATCH_FILES}장)"
         }
     }
 
@@ -718,8 +1442,9 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "v7.2_auto_firebase_detection",
+        "analysis_ready": analysis_ready,  # False면 워밍업 중 (분석 엔드포인트 503)
         "features_ready": {
-            "mediapipe": True,
+            "mediapipe": analysis_ready,
             "face_shape_analysis": True,
             "auto_firebase_detection": True,
             "hairstyle_recommendations": True,
@@ -809,17 +1534,17 @@ async def test_firebase_file(filename: str):
         encoded_filename = quote(filename, safe='')
         test_url = f"{FIREBASE_BASE_URL}{encoded_filename}?alt=media"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(test_url) as response:
-                return {
-                    "filename": filename,
-                    "encoded_filename": encoded_filename,
-                    "test_url": test_url,
-                    "status_code": response.status,
-                    "accessible": response.status == 200,
-                    "content_type": response.headers.get("content-type", "unknown"),
-                    "file_exists": response.status != 404
-                }
+        session = get_http_session()
+        async with session.get(test_url) as response:
+            return {
+                "filename": filename,
+                "encoded_filename": encoded_filename,
+                "test_url": test_url,
+                "status_code": response.status,
+                "accessible": response.status == 200,
+                "content_type": response.headers.get("content-type", "unknown"),
+                "file_exists": response.status != 404
+            }
                 
     except Exception as e:
         return {
@@ -841,17 +1566,16 @@ async def test_direct_firebase():
     
     for filename in test_files:
         try:
-            encoded_filename = quote(filename, safe='')
-            test_url = f"{FIREBASE_BASE_URL}{encoded_filename}?alt=media"
+            test_url = build_firebase_url(filename)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(test_url) as response:
-                    results.append({
-                        "filename": filename,
-                        "status": response.status,
-                        "accessible": response.status == 200,
-                        "url": test_url
-                    })
+            session = get_http_session()
+            async with session.get(test_url) as response:
+                results.append({
+                    "filename": filename,
+                    "status": response.status,
+                    "accessible": response.status == 200,
+                    "url": test_url
+                })
                     
         except Exception as e:
             results.append({
@@ -867,6 +1591,11 @@ async def test_direct_firebase():
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    print(f"🚀 HAIRGATOR v7.2 자동 Firebase 감지 시스템 시작 (포트: {port})")
-    print(f"🔥 Firebase 파일 자동 감지 및 매핑 시스템 활성화 (5분 캐시)")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    logger.info("🚀 HAIRGATOR v7.2 자동 Firebase 감지 시스템 시작 (포트: %d)", port)
+    logger.info("🔥 Firebase 파일 자동 감지 및 매핑 시스템 활성화 (5분 캐시)")
+    
+    if UVICORN_WORKERS > 1:
+        # 멀티 프로세스는 import 문자열이 필요 (각 워커 프로세스가 main을 새로 import)
+        uvicorn.run("main:app", host="0.0.0.0", port=port, workers=UVICORN_WORKERS)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)